@@ -4,15 +4,43 @@ Crowdstrike CTE Plugin implementation.
 
 from netskope.integrations.cte.plugin_base import PluginBase, ValidationResult, PushResult
 from netskope.integrations.cte.models import Indicator, IndicatorType
-from typing import Dict, List, Tuple
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from itertools import islice
+from typing import Dict, Generator, List, Tuple, Union
+from urllib.parse import urlencode
 from .utils.constants import (
     PLUGIN_NAME,
     PLUGIN_VERSION,
     MODULE_NAME,
-    PLATFORM_NAME
+    PLATFORM_NAME,
+    PULL_PAGE_SIZE,
+    DETAIL_BATCH_SIZE,
+    MAX_WORKERS,
 )
 from .utils.helper import CrowdstrikePluginHelper, CrowdstrikePluginException
 
+try:
+    import ijson
+except ImportError:
+    # Fall back to parsing whole responses when ijson is not installed.
+    ijson = None
+
+# Dict-less intermediate for mapped IOCs; workers produce these and they are
+# only turned into Indicator models when a batch is handed to the caller.
+_IOC = namedtuple("IOC", ["value", "type", "comments", "firstSeen", "lastSeen"])
+
+# CrowdStrike IOC type -> Netskope IndicatorType. The standard CTE models only
+# have URL, MD5 and SHA256, so domains and IPs are both ingested as URL.
+_IOC_TYPE_MAP = {
+    "sha256": IndicatorType.SHA256,
+    "md5": IndicatorType.MD5,
+    "domain": IndicatorType.URL,
+    "ipv4": IndicatorType.URL,
+    "ipv6": IndicatorType.URL,
+}
+
 class CrowdstrikePlugin(PluginBase):
     """The Crowdstrike CTE plugin implementation."""
 
@@ -27,20 +55,99 @@ class CrowdstrikePlugin(PluginBase):
             self.logger, self.log_prefix, self.plugin_name, self.plugin_version
         )
 
-    def _get_plugin_info(self) -> Tuple[str, str]:
+    @classmethod
+    @cache
+    def _get_plugin_info(cls) -> Tuple[str, str]:
         """Get plugin name and version from manifest."""
-        try:
-            manifest_json = CrowdstrikePlugin.metadata
-            plugin_name = manifest_json.get("name", PLUGIN_NAME)
-            plugin_version = manifest_json.get("version", PLUGIN_VERSION)
-            return plugin_name, plugin_version
-        except Exception as exp:
-            self.logger.error(f"Error getting plugin details: {exp}")
-        return PLUGIN_NAME, PLUGIN_VERSION
-
-    def pull(self) -> List[Indicator]:
-        """Pull indicators from Crowdstrike."""
+        manifest_json = getattr(cls, "metadata", None) or {}
+        plugin_name = manifest_json.get("name", PLUGIN_NAME)
+        plugin_version = manifest_json.get("version", PLUGIN_VERSION)
+        return plugin_name, plugin_version
+
+    def _parse_iocs(self, items) -> List[_IOC]:
+        """Map CrowdStrike IOC detail items to compact _IOC tuples."""
+        # Gather the fields column-wise in a single pass over the items, then
+        # zip the columns into slot-only tuples, dropping unsupported types.
+        type_map = _IOC_TYPE_MAP
+        values, types, comments, first_seen, last_seen = [], [], [], [], []
+        for item in items:
+            try:
+                get = item.get
+                value, ioc_type = get("value"), type_map.get(get("type"))
+                comment = get("description", "Crowdstrike IOC")
+                first, last = get("created_on"), get("modified_on")
+            except Exception as inner_e:
+                self.logger.error(f"{self.log_prefix}: Error parsing indicator {item}: {inner_e}")
+                continue
+            values.append(value)
+            types.append(ioc_type)
+            comments.append(comment)
+            first_seen.append(first)
+            last_seen.append(last)
+
+        return [
+            ioc
+            for ioc in map(_IOC, values, types, comments, first_seen, last_seen)
+            if ioc.type and ioc.value
+        ]
+
+    def _to_indicators(self, iocs) -> List[Indicator]:
+        """Convert _IOC tuples to Indicators right before they are yielded."""
+        indicators = []
+        append = indicators.append
+        _Indicator = Indicator
+        for value, indicator_type, comment, first, last in iocs:
+            try:
+                append(_Indicator(
+                    value=value,
+                    type=indicator_type,
+                    comments=comment,
+                    firstSeen=first,
+                    lastSeen=last
+                ))
+            except Exception as inner_e:
+                self.logger.error(f"{self.log_prefix}: Error parsing indicator {value}: {inner_e}")
+        return indicators
+
+    def _fetch_ioc_ids(self, query_url, headers) -> List[str]:
+        """Page through the IOC query endpoint and return all IOC IDs."""
+        ioc_ids = []
+        params = {"limit": PULL_PAGE_SIZE}
+        while True:
+            response = self.helper.api_helper("GET", query_url, params=params, headers=headers, proxies=self.proxy, verify=self.ssl_validation)
+            resources = response.get("resources") or []
+            ioc_ids.extend(resources)
+
+            pagination = response.get("meta", {}).get("pagination", {})
+            if not resources or len(ioc_ids) >= pagination.get("total", 0):
+                return ioc_ids
+
+            # Prefer the "after" cursor when the tenant returns one; deep
+            # offsets get slow and are capped by the API.
+            after = pagination.get("after")
+            if after:
+                params = {"limit": PULL_PAGE_SIZE, "after": after}
+            else:
+                params = {"limit": PULL_PAGE_SIZE, "offset": len(ioc_ids)}
+
+    def pull(self) -> Union[List[Indicator], Generator[Tuple[List[Indicator], None], None, None]]:
+        """Pull indicators from Crowdstrike.
+
+        When the core supports sub-checkpoints, returns a generator of
+        (indicators, sub_checkpoint) tuples, one per detail batch; otherwise
+        returns all indicators as a single list.
+        """
+        if hasattr(self, "sub_checkpoint"):
+            return self._pull_batches()
+
         indicators = []
+        for batch_indicators, _ in self._pull_batches():
+            indicators.extend(batch_indicators)
+        return indicators
+
+    def _pull_batches(self) -> Generator[Tuple[List[Indicator], None], None, None]:
+        """Yield (indicators, sub_checkpoint) for each IOC detail batch."""
+        pulled = 0
         try:
             base_url = self.configuration.get("base_url").strip().rstrip("/")
             client_id = self.configuration.get("client_id")
@@ -53,78 +160,65 @@ class CrowdstrikePlugin(PluginBase):
             query_url = f"{base_url}/iocs/queries/indicators/v1"
             self.logger.info(f"{self.log_prefix}: Fetching IOC IDs from {query_url}")
             
-            # Basic implementation for now, fetching default limit
-            response = self.helper.api_helper("GET", query_url, headers=headers, proxies=self.proxy, verify=self.ssl_validation)
-            ioc_ids = response.get("resources", [])
+            ioc_ids = self._fetch_ioc_ids(query_url, headers)
             self.logger.info(f"{self.log_prefix}: Found {len(ioc_ids)} IOC IDs.")
 
             if not ioc_ids:
-                return indicators
+                return
 
             # Step 2: Get IOC Details
             details_url = f"{base_url}/iocs/entities/indicators/v1"
-            batch_size = 100
-            
-            for i in range(0, len(ioc_ids), batch_size):
-                batch_ids = ioc_ids[i:i + batch_size]
-                # Pass IDs as a list of tuples for requests params handling if needed, 
-                # but helper might just take dict or string. 
-                # Requests handles repeated keys 'ids' if passed as list of tuples or bytes, 
-                # but our helper wraps requests. Let's see how helper passes params.
-                # Helper passes params directly to requests.request.
-                
-                # 'requests' library handles multiple values for same key if passed as list of tuples
-                params = [('ids', x) for x in batch_ids]
-                
-                det_response = self.helper.api_helper("GET", details_url, params=params, headers=headers, proxies=self.proxy, verify=self.ssl_validation)
-                resources = det_response.get("resources", [])
-                
-                for item in resources:
-                    # Map to Indicator
-                    try:
-                        value = item.get("value")
-                        itype = item.get("type")
-                        
-                        indicator_type = None
-                        if itype == "sha256":
-                            indicator_type = IndicatorType.SHA256
-                        elif itype == "md5":
-                            indicator_type = IndicatorType.MD5
-                        elif itype == "domain":
-                            indicator_type = IndicatorType.URL
-                        elif itype == "ipv4":
-                            # Netskope IndicatorType doesn't have IP specifically usually distinct from URL in some plugins, 
-                            # strictly it's URL but let's check if there is strict typing. 
-                            # Usually URL covers domains and IPs for many CE plugins, or they use logic to distinguish.
-                            # Standard CTE models: URL, MD5, SHA256. 
-                            # If checking standard IndicatorType enum: URL, MD5, SHA256.
-                            indicator_type = IndicatorType.URL
-                        elif itype == "ipv6":
-                            indicator_type = IndicatorType.URL
-                        
-                        if indicator_type and value:
-                            if itype in ["ipv4", "ipv6"] and indicator_type == IndicatorType.URL:
-                                # Start with http:// can be safer for URL type if strictly validated, but raw IP often works.
-                                # Let's keep raw value for now unless validation fails.
-                                pass
-
-                            indicators.append(Indicator(
-                                value=value,
-                                type=indicator_type,
-                                comments=item.get("description", "Crowdstrike IOC"),
-                                firstSeen=item.get("created_on"),
-                                lastSeen=item.get("modified_on")
-                            ))
-                    except Exception as inner_e:
-                        self.logger.error(f"{self.log_prefix}: Error parsing indicator {item}: {inner_e}")
-                        continue
-
-            self.logger.info(f"{self.log_prefix}: Pulled {len(indicators)} indicators.")
+            batches = (
+                ioc_ids[i:i + DETAIL_BATCH_SIZE]
+                for i in range(0, len(ioc_ids), DETAIL_BATCH_SIZE)
+            )
+
+            def fetch_batch(batch_ids):
+                # Serialize the repeated 'ids' keys once into the URL rather
+                # than handing requests a list of tuples to encode.
+                batch_url = f"{details_url}?{urlencode({'ids': batch_ids}, doseq=True)}"
+                if ijson is None:
+                    det_response = self.helper.api_helper("GET", batch_url, headers=headers, proxies=self.proxy, verify=self.ssl_validation)
+                    return self._parse_iocs(det_response.get("resources", []))
+
+                # Parse the detail payload incrementally so each IOC is mapped
+                # as it arrives instead of materializing the whole response.
+                det_response = self.helper.api_helper("GET", batch_url, headers=headers, proxies=self.proxy, verify=self.ssl_validation, stream=True)
+                with det_response:
+                    det_response.raw.decode_content = True
+                    return self._parse_iocs(
+                        ijson.items(det_response.raw, "resources.item")
+                    )
+
+            # Batches are independent, so fetch them concurrently over the
+            # helper's pooled session. At most MAX_WORKERS batches are
+            # submitted ahead of the consumer, which also keeps concurrency
+            # within CrowdStrike rate limits.
+            executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+            in_flight = deque(
+                executor.submit(fetch_batch, batch_ids)
+                for batch_ids in islice(batches, MAX_WORKERS)
+            )
+            try:
+                while in_flight:
+                    batch_iocs = in_flight.popleft().result()
+                    next_ids = next(batches, None)
+                    if next_ids is not None:
+                        in_flight.append(executor.submit(fetch_batch, next_ids))
+
+                    batch_indicators = self._to_indicators(batch_iocs)
+                    pulled += len(batch_indicators)
+                    yield batch_indicators, None
+            finally:
+                # Drop batches not yet started if the consumer stops early.
+                executor.shutdown(wait=True, cancel_futures=True)
+
+            self.logger.info(f"{self.log_prefix}: Pulled {pulled} indicators.")
         except Exception as e:
             self.logger.error(f"{self.log_prefix}: Error pulling indicators: {e}")
             raise
-        
-        return indicators
+        finally:
+            self.helper.close()
 
     def push(self, indicators: List[Indicator], action_dict: Dict) -> PushResult:
         """Push indicators to Crowdstrike."""
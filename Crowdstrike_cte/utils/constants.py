@@ -7,3 +7,12 @@ PLATFORM_NAME = "Crowdstrike"
 DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
 PUSH_PAGE_SIZE = 2000
 PULL_PAGE_SIZE = 2000
+MAX_RETRIES = 5
+RETRY_BACKOFF = 0.5
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+RETRY_METHODS = ["GET", "POST"]
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+DETAIL_BATCH_SIZE = 100
+MAX_WORKERS = 8
+TOKEN_EXPIRY_MARGIN = 60
@@ -1,8 +1,37 @@
 """Crowdstrike Plugin Helper."""
 
 import requests
+import threading
 import time
-from .constants import PLUGIN_NAME
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Fastest available JSON decoder.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    try:
+        from ujson import loads as _json_loads
+    except ImportError:
+        from json import loads as _json_loads
+
+from .constants import (
+    PLUGIN_NAME,
+    MAX_RETRIES,
+    RETRY_BACKOFF,
+    RETRY_STATUS_CODES,
+    RETRY_METHODS,
+    POOL_CONNECTIONS,
+    POOL_MAXSIZE,
+    TOKEN_EXPIRY_MARGIN,
+)
+
+# OAuth2 tokens keyed by (base_url, client_id, client_secret), shared across
+# plugin instances. Values are (access_token, monotonic expiry time).
+_TOKEN_CACHE = {}
+# One lock per cache key, so a slow token request for one tenant does not
+# block the others.
+_TOKEN_LOCKS = {}
 
 class CrowdstrikePluginException(Exception):
     """Crowdstrike Plugin Exception."""
@@ -17,6 +46,31 @@ class CrowdstrikePluginHelper(object):
         self.log_prefix = log_prefix
         self.plugin_name = plugin_name
         self.plugin_version = plugin_version
+        # Cache key of the token this helper last handed out.
+        self._token_key = None
+        # Keep a single session so the TLS connection to the API is reused
+        # across the auth call and all paginated/batched requests.
+        self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS,
+                pool_maxsize=POOL_MAXSIZE,
+                # Retry 429/5xx with backoff, honoring Retry-After.
+                max_retries=Retry(
+                    total=MAX_RETRIES,
+                    backoff_factor=RETRY_BACKOFF,
+                    status_forcelist=RETRY_STATUS_CODES,
+                    allowed_methods=RETRY_METHODS,
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                ),
+            ),
+        )
+
+    def close(self):
+        """Close the underlying HTTP session."""
+        self._session.close()
 
     def api_helper(
         self,
@@ -30,13 +84,19 @@ class CrowdstrikePluginHelper(object):
         logger_msg=None,
         proxies=None,
         verify=True,
+        stream=False,
     ):
-        """API Helper to perform HTTP requests."""
+        """API Helper to perform HTTP requests.
+
+        When stream is True the successful requests.Response is returned
+        unread so the caller can parse the body incrementally; the caller
+        is responsible for closing it.
+        """
         if logger_msg:
             self.logger.debug(f"{self.log_prefix}: {logger_msg}")
 
         try:
-            response = requests.request(
+            response = self._session.request(
                 method=method,
                 url=url,
                 params=params,
@@ -45,10 +105,17 @@ class CrowdstrikePluginHelper(object):
                 json=json,
                 proxies=proxies,
                 verify=verify,
+                stream=stream,
             )
             
+            if response.status_code == 401 and self._token_key:
+                # Drop the rejected token so the next pull fetches a new one.
+                _TOKEN_CACHE.pop(self._token_key, None)
+
             if response.status_code in [200, 201]:
-                return response.json()
+                if stream:
+                    return response
+                return _json_loads(response.content)
             else:
                 self.logger.error(
                     f"{self.log_prefix}: HTTP Request Failed. Status: {response.status_code}. Response: {response.text}"
@@ -71,12 +138,25 @@ class CrowdstrikePluginHelper(object):
             "client_secret": client_secret
         }
         
-        # Using api_helper might be recursive or specific, but here simple call is better to separate auth logic
-        try:
-            response = requests.post(auth_url, headers=headers, data=data, proxies=proxies, verify=verify)
-            if response.status_code in [200, 201]:
-                 return response.json().get("access_token")
-            else:
-                 raise CrowdstrikePluginException(f"Auth Failed: {response.text}")
-        except Exception as e:
-             raise CrowdstrikePluginException(f"Auth Exception: {e}")
+        cache_key = self._token_key = (base_url, client_id, client_secret)
+        # Hold the key's lock across the POST so concurrent callers for the
+        # same tenant wait for a single token request.
+        with _TOKEN_LOCKS.setdefault(cache_key, threading.Lock()):
+            cached = _TOKEN_CACHE.get(cache_key)
+            if cached and time.monotonic() < cached[1] - TOKEN_EXPIRY_MARGIN:
+                return cached[0]
+
+            # Using api_helper might be recursive or specific, but here simple call is better to separate auth logic
+            try:
+                response = self._session.post(auth_url, headers=headers, data=data, proxies=proxies, verify=verify)
+                if response.status_code in [200, 201]:
+                     auth_json = response.json()
+                     token = auth_json.get("access_token")
+                     if token:
+                         expires_at = time.monotonic() + auth_json.get("expires_in", 0)
+                         _TOKEN_CACHE[cache_key] = (token, expires_at)
+                     return token
+                else:
+                     raise CrowdstrikePluginException(f"Auth Failed: {response.text}")
+            except Exception as e:
+                 raise CrowdstrikePluginException(f"Auth Exception: {e}")
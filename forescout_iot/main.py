@@ -5,6 +5,10 @@ Forescout Plugin Main File.
 import requests
 import traceback
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from itertools import chain
 from typing import List, Dict, Tuple
 
 from netskope.integrations.iot.models.asset import Asset
@@ -19,10 +23,42 @@ from .utils.forescout_constants import (
     PLUGIN_VERSION,
     API_ENDPOINTS,
     DEFAULT_LOOKBACK_MINS,
+    MAX_PAGES,
+    PREFETCH_PAGES,
+    STREAM_CHUNK_SIZE,
+    MAX_SEEN_ASSETS,
+    VALIDATE_ASSETS,
     REM_ASSET_FIELDS,
+    ASSET_FIELD_MAP,
 )
 from .utils.forescout_helper import ForescoutPluginHelper
 
+try:
+    import ijson
+except ImportError:
+    # Fall back to decoding whole pages when ijson is not installed.
+    ijson = None
+
+# Keys a rem-assets page may hold its records under, in order of preference.
+_RESULT_KEYS = ("results", "detections", "data")
+
+# Record fields used to identify and tag an asset.
+_ASSET_KEYS = (
+    "ip_addresses",
+    "mac_addresses",
+    "rem_function",
+)
+
+
+def _close_pending_page(future):
+    """Close a streamed page response that was fetched but never consumed."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    response = future.result()
+    if isinstance(response, requests.Response):
+        response.close()
+
+
 class ForescoutPlugin(IotPluginBase):
     """ForescoutPlugin class."""
 
@@ -48,36 +84,84 @@ class ForescoutPlugin(IotPluginBase):
             plugin_version=self.plugin_version,
             configuration=self.configuration,
         )
+        configuration = self.configuration or {}
+        base_url = configuration.get("base_url", "").strip().rstrip("/")
+        self._urls = {key: value.format(base_url) for key, value in API_ENDPOINTS.items()}
+        self.forescout_helper.headers.update({
+            "Authorization": f"Bearer {configuration.get('api_token')}",
+            "Content-Type": "application/json"
+        })
 
-    def _get_plugin_info(self) -> Tuple[str, str]:
+    @classmethod
+    @cache
+    def _get_plugin_info(cls) -> Tuple[str, str]:
         """Get plugin name and version from metadata."""
+        metadata_json = getattr(cls, "metadata", None) or {}
+        plugin_name = metadata_json.get("name", PLUGIN_NAME)
+        plugin_version = metadata_json.get("version", PLUGIN_VERSION)
+        return plugin_name, plugin_version
+
+    def _page_results(self, response):
+        """Yield the asset records of a single rem-assets page.
+
+        Args:
+            response (Union[Dict, List, requests.Response]): Decoded page, or
+                the unread streamed response when ijson is available.
+        """
+        if isinstance(response, requests.Response):
+            with response:
+                response.raw.decode_content = True
+                yield from self._stream_results(response.raw)
+            return
+
+        # Assume the usual dict payload and only inspect the type
+        # when that fails.
         try:
-            metadata_json = ForescoutPlugin.metadata
-            plugin_name = metadata_json.get("name", PLUGIN_NAME)
-            plugin_version = metadata_json.get("version", PLUGIN_VERSION)
-            return plugin_name, plugin_version
-        except Exception as exp:
-            self.logger.error(
-                message=(
-                    f"{MODULE_NAME} {PLUGIN_NAME}: Error occurred while"
-                    f" getting plugin details. Error: {exp}"
-                ),
-                details=str(traceback.format_exc()),
-            )
-        return PLUGIN_NAME, PLUGIN_VERSION
+            results = next(filter(None, map(response.get, _RESULT_KEYS)), [])
+        except AttributeError:
+            if isinstance(response, list):
+                results = response
+            else:
+                self.logger.error(f"{self.log_prefix}: Unexpected API response format: {type(response)}")
+                results = []
+        yield from results
+
+    def _stream_results(self, raw):
+        """Incrementally yield the records of a streamed rem-assets page.
+
+        Accepts the same shapes as the decoded path: a bare list, or a dict
+        holding the records under one of _RESULT_KEYS. For a dict, the first
+        of those keys present in the body is used.
+
+        Args:
+            raw: Raw response body.
+        """
+        # risk_score is only formatted into tags, so floats are enough.
+        events = ijson.parse(raw, use_float=True)
+        try:
+            first = next(events)
+        except ijson.IncompleteJSONError:
+            # Empty body.
+            return
+
+        if first[1] == "start_array":
+            yield from ijson.items(chain((first,), events), "item")
+            return
+        if first[1] != "start_map":
+            self.logger.error(f"{self.log_prefix}: Unexpected API response format: {first[1]}")
+            return
+
+        for prefix, event, value in events:
+            if not prefix and event == "map_key" and value in _RESULT_KEYS:
+                yield from ijson.items(events, f"{value}.item")
+                return
 
     def pull(self):
         """Pull assets from Forescout."""
         self.logger.info(f"{self.log_prefix}: Fetching assets.")
 
         try:
-            base_url = self.configuration.get("base_url", "").strip().rstrip("/")
-            url = API_ENDPOINTS["rem_assets"].format(base_url)
-            
-            headers = {
-                "Authorization": f"Bearer {self.configuration.get('api_token')}",
-                "Content-Type": "application/json"
-            }
+            url = self._urls["rem_assets"]
 
             # Determine time window
             current_time_ms = int(time.time() * 1000)
@@ -85,89 +169,140 @@ class ForescoutPlugin(IotPluginBase):
             
             page_number = 0
             has_more_data = True
+            is_first = True
+            # Last chunk is held back so the final yield can set is_last.
+            pending = None
+            # (ip, mac) pairs already emitted, bounded to MAX_SEEN_ASSETS.
+            seen = OrderedDict()
+            # Shares one string per distinct OS/vendor/category value.
+            intern = {}.setdefault
+            if VALIDATE_ASSETS:
+                build_asset = Asset
+            else:
+                build_asset = getattr(Asset, "model_construct", None) or getattr(Asset, "construct", Asset)
+
+            payload = {
+                 "from_utc_millis": current_time_ms - lookback_ms,
+                 "to_utc_millis": current_time_ms,
+                 "selected_fields": REM_ASSET_FIELDS,
+                 "page_number": page_number
+            }
             
-            while has_more_data:
-                payload = {
-                     "from_utc_millis": current_time_ms - lookback_ms,
-                     "to_utc_millis": current_time_ms,
-                     "selected_fields": REM_ASSET_FIELDS,
-                     "page_number": page_number
-                }
-                
-                self.logger.info(f"{self.log_prefix}: Fetching page {page_number}.")
+            def fetch_page(page):
+                self.logger.debug(f"{self.log_prefix}: Fetching page {page}.")
 
-                response = self.forescout_helper.api_helper(
+                return self.forescout_helper.api_helper(
                     url=url,
                     method="POST",
-                    headers=headers,
                     proxies=self.proxy,
                     verify=self.ssl_validation,
-                    logger_msg=f"fetching assets page {page_number}",
-                    json=payload
+                    logger_msg=f"fetching assets page {page}",
+                    json={**payload, "page_number": page},
+                    is_handle_error_required=False,
+                    stream=ijson is not None,
                 )
 
-                if isinstance(response, dict):
-                    results = response.get("results", [])
-                else:
-                    self.logger.error(f"{self.log_prefix}: Unexpected API response format: {type(response)}")
-                    results = []
-
-                if not results:
-                    self.logger.info(f"{self.log_prefix}: No more results found on page {page_number}.")
-                    break
+            # Up to PREFETCH_PAGES requests in flight; refilled only once a
+            # page turns out non-empty.
+            executor = ThreadPoolExecutor(max_workers=PREFETCH_PAGES)
+            in_flight = deque(
+                executor.submit(fetch_page, page)
+                for page in range(min(PREFETCH_PAGES, MAX_PAGES + 1))
+            )
+            next_submit = len(in_flight)
+            try:
+                while has_more_data:
+                    response = in_flight.popleft().result()
+                    # Status errors are only reported for pages actually read.
+                    if isinstance(response, requests.Response):
+                        self.forescout_helper.handle_error(
+                            response, f"fetching assets page {page_number}"
+                        )
 
-                assets = []
-                for item in results:
-                    ip_list = item.get("ip_addresses", [])
-                    mac_list = item.get("mac_addresses", [])
+                    # Yield tuple: (assets, is_first_page, is_last_page, count, total_count_placeholder)
+                    record_count = 0
+                    page_assets = 0
+                    assets = []
+                    for item in self._page_results(response):
+                        if not record_count and next_submit <= MAX_PAGES:
+                            in_flight.append(executor.submit(fetch_page, next_submit))
+                            next_submit += 1
+                        record_count += 1
+                        get = item.get
+                        ip_list, mac_list, function = map(get, _ASSET_KEYS)
                     
-                    ip_address = ip_list[0] if ip_list else None
-                    mac_address = mac_list[0] if mac_list else None
+                        ip_address = ip_list[0] if ip_list else None
+                        mac_address = mac_list[0] if mac_list else None
                     
-                    # We need at least an IP or MAC/Hostname to create an asset
-                    if ip_address or mac_address:
-                        
-                        asset_tags = []
-                        if item.get("rem_function"):
-                             asset_tags.append(f"Function: {item.get('rem_function')}")
-                        if "risk_score" in item:
-                             asset_tags.append(f"Risk Score: {item.get('risk_score')}")
-
-                        asset = Asset(
-                            ip=ip_address,
-                            mac_address=mac_address,
-                            tags=asset_tags,
-                            use_asset=True
-                        )
-                        
-                        # Add extended attributes
-                        if item.get("rem_os"):
-                            asset.os = item.get("rem_os")
-                        
-                        if item.get("rem_vendor"):
-                            asset.manufacturer = item.get("rem_vendor")
-                        
-                        if item.get("rem_category"):
-                            asset.category = item.get("rem_category")
-                            
-                        assets.append(asset)
-                
-                self.logger.info(f"{self.log_prefix}: Successfully fetched {len(assets)} assets from page {page_number}.")
-                
-                # Yield tuple: (assets, is_first_page, is_last_page, count, total_count_placeholder)
-                # Since we don't know total count or if this is the last page definitively until we get empty results next time, defines logic here.
-                # Actually for this iterator pattern we can just yield.
-                # If we received less than we asked for (implied batch size), maybe we are done? 
-                # The API doesn't seem to document page size in the request provided, assuming server side default.
-                
-                yield assets, page_number == 0, False, len(assets), 0
+                        # We need at least an IP or MAC/Hostname to create an asset
+                        if ip_address or mac_address:
+                            key = (ip_address, mac_address)
+                            if key in seen:
+                                seen.move_to_end(key)
+                                continue
+                            seen[key] = None
+                            if len(seen) > MAX_SEEN_ASSETS:
+                                seen.popitem(last=False)
+
+                            asset_tags = []
+                            if function:
+                                 asset_tags.append(f"Function: {function}")
+                            if "risk_score" in item:
+                                 asset_tags.append(f"Risk Score: {item['risk_score']}")
+
+                            # Add extended attributes
+                            attributes = {
+                                attribute: intern(value, value)
+                                for key, attribute in ASSET_FIELD_MAP
+                                if (value := get(key))
+                            }
+                            assets.append(build_asset(
+                                ip=ip_address,
+                                mac_address=mac_address,
+                                tags=asset_tags,
+                                use_asset=True,
+                                **attributes
+                            ))
+
+                            if len(assets) >= STREAM_CHUNK_SIZE:
+                                page_assets += len(assets)
+                                if pending:
+                                    yield pending, is_first, False, len(pending), 0
+                                    is_first = False
+                                pending = assets
+                                assets = []
+
+                    if not record_count:
+                        self.logger.info(f"{self.log_prefix}: No more results found on page {page_number}.")
+                        break
+
+                    page_assets += len(assets)
+                    self.logger.info(f"{self.log_prefix}: Successfully fetched {page_assets} assets from page {page_number}.")
+                    if assets:
+                        if pending:
+                            yield pending, is_first, False, len(pending), 0
+                            is_first = False
+                        pending = assets
                 
-                page_number += 1
+                    page_number += 1
                 
-                # Sanity check to prevent infinite loops if API is misbehaving
-                if page_number > 1000:
-                    self.logger.warning(f"{self.log_prefix}: Reached maximum page limit.")
-                    break
+                    # Sanity check to prevent infinite loops if API is misbehaving
+                    if page_number > MAX_PAGES:
+                        self.logger.warning(f"{self.log_prefix}: Reached maximum page limit.")
+                        break
+            except Exception:
+                # Hand over the assets already built before failing.
+                if pending:
+                    yield pending, is_first, False, len(pending), 0
+                raise
+            finally:
+                # Release pages fetched past the last one.
+                executor.shutdown(wait=False, cancel_futures=True)
+                for future in in_flight:
+                    future.add_done_callback(_close_pending_page)
+
+            if pending:
+                yield pending, is_first, True, len(pending), 0
 
         except requests.exceptions.RequestException as exp:
             self.logger.error(
@@ -18,7 +18,16 @@ API_ENDPOINTS = {
 DEFAULT_BATCH_SIZE = 100
 MAX_RETRIES = 3
 RETRY_BACKOFF = 1
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+RETRY_METHODS = frozenset({"GET", "POST", "PUT", "DELETE"})
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 32
 DEFAULT_LOOKBACK_MINS = 60
+MAX_PAGES = 1000
+PREFETCH_PAGES = 4
+STREAM_CHUNK_SIZE = 500
+MAX_SEEN_ASSETS = 100000
+VALIDATE_ASSETS = False
 
 REM_ASSET_FIELDS = [
     "ip_addresses",
@@ -29,3 +38,10 @@ REM_ASSET_FIELDS = [
     "rem_function",
     "risk_score"
 ]
+
+# Forescout record key -> Asset attribute, for attributes copied as-is.
+ASSET_FIELD_MAP = (
+    ("rem_os", "os"),
+    ("rem_vendor", "manufacturer"),
+    ("rem_category", "category"),
+)
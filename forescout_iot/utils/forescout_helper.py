@@ -2,18 +2,98 @@
 Forescout Plugin Helper.
 """
 
-import time
+import atexit
+import threading
 import traceback
 import requests
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Union
+from urllib.parse import urlsplit
+
+# orjson or ujson when installed, otherwise the stdlib decoder.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    try:
+        from ujson import loads as _json_loads
+    except ImportError:
+        from json import loads as _json_loads
 
 from .forescout_constants import (
     MODULE_NAME,
     PLUGIN_NAME,
     MAX_RETRIES,
     RETRY_BACKOFF,
+    RETRY_STATUS_CODES,
+    RETRY_METHODS,
+    POOL_CONNECTIONS,
+    POOL_MAXSIZE,
 )
 
+# Sessions shared by every helper in the process, keyed by host, so plugin
+# instances pointed at the same appliance share one keep-alive pool.
+_SESSIONS: Dict[str, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    """Build a pooled session with retries for a single Forescout host.
+
+    Returns:
+        requests.Session: Session object.
+    """
+    session = requests.Session()
+    # The session is shared by every configuration on this host, so never
+    # keep cookies from one tenant's responses for another's requests.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        # Once retries run out the last response is returned, not raised.
+        max_retries=Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=RETRY_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _get_session(url: str) -> requests.Session:
+    """Return the shared session for the host of the given URL.
+
+    Args:
+        url (str): Request URL.
+
+    Returns:
+        requests.Session: Session object.
+    """
+    host = urlsplit(url).netloc
+    session = _SESSIONS.get(host)
+    if session is None:
+        with _SESSIONS_LOCK:
+            session = _SESSIONS.get(host)
+            if session is None:
+                session = _SESSIONS[host] = _build_session()
+    return session
+
+
+@atexit.register
+def _close_sessions():
+    """Close all shared sessions on interpreter shutdown."""
+    with _SESSIONS_LOCK:
+        for session in _SESSIONS.values():
+            session.close()
+        _SESSIONS.clear()
+
+
 class ForescoutPluginHelper:
     """ForescoutPluginHelper class.
 
@@ -37,18 +117,17 @@ class ForescoutPluginHelper:
         self.plugin_name = plugin_name
         self.plugin_version = plugin_version
         self.configuration = configuration
+        self._user_agent = self._build_user_agent()
+        # Per-instance headers; the shared session carries none.
+        self.headers = {"User-Agent": self._user_agent}
 
-    def _add_user_agent(self, headers: Union[Dict, None] = None) -> Dict:
-        """Add User-Agent to the headers.
-
-        Args:
-            headers (Dict): Headers dictionary.
+    def _build_user_agent(self) -> str:
+        """Build the User-Agent string for this plugin.
 
         Returns:
-            Dict: Headers dictionary with User-Agent.
+            str: User-Agent string.
         """
-        if headers is None:
-            headers = {}
+        headers = {}
         try:
             from netskope.common.utils import add_user_agent
             headers = add_user_agent(headers)
@@ -57,14 +136,12 @@ class ForescoutPluginHelper:
             headers["User-Agent"] = "netskope-ce"
 
         ce_added_agent = headers.get("User-Agent", "netskope-ce")
-        user_agent = "{}-{}-{}-v{}".format(
+        return "{}-{}-{}-v{}".format(
             ce_added_agent,
             MODULE_NAME.lower(),
             self.plugin_name.lower().replace(" ", "-"),
             self.plugin_version,
         )
-        headers.update({"User-Agent": user_agent})
-        return headers
 
     def api_helper(
         self,
@@ -78,6 +155,7 @@ class ForescoutPluginHelper:
         logger_msg: str = None,
         proxies: Dict = None,
         verify: bool = True,
+        stream: bool = False,
     ) -> Union[Dict, requests.Response]:
         """API Helper to perform API request.
 
@@ -86,48 +164,57 @@ class ForescoutPluginHelper:
             method (str): Method to perform request.
             params (Dict, optional): Parameters. Defaults to None.
             data (Dict, optional): Data. Defaults to None.
-            headers (Dict, optional): Headers. Defaults to None.
+            headers (Dict, optional): Extra headers merged over the
+                helper's default headers. Defaults to None.
             json (Dict, optional): JSON. Defaults to None.
             is_handle_error_required (bool, optional): Handle error. Defaults to True.
             logger_msg (str, optional): Logger message. Defaults to None.
             proxies (Dict, optional): Proxies. Defaults to None.
             verify (bool, optional): Verify. Defaults to True.
+            stream (bool, optional): Return the successful response unread
+                so the caller can parse the body incrementally; the caller
+                must close it. Defaults to False.
 
         Returns:
             Union[Dict, requests.Response]: Response.
         """
         try:
-            headers = self._add_user_agent(headers)
-            for retry in range(MAX_RETRIES):
-                response = requests.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    data=data,
-                    headers=headers,
-                    json=json,
-                    proxies=proxies,
-                    verify=verify,
+            headers = {**self.headers, **headers} if headers else self.headers
+            response = _get_session(url).request(
+                method=method,
+                url=url,
+                params=params,
+                data=data,
+                headers=headers,
+                json=json,
+                proxies=proxies,
+                verify=verify,
+                stream=stream,
+            )
+            if response.status_code == 429 and is_handle_error_required:
+                self.logger.error(
+                    f"{self.log_prefix}: Max retries reached for 429 error."
                 )
-                if response.status_code == 429:
-                    if retry == MAX_RETRIES - 1:
-                        self.logger.error(
-                            f"{self.log_prefix}: Max retries reached for 429 error."
-                        )
-                        raise requests.exceptions.HTTPError(response=response)
-                    time.sleep(RETRY_BACKOFF * (2 ** retry))
-                    continue
-                
-                if is_handle_error_required:
-                    self.handle_error(response, logger_msg)
-                
-                if response.status_code in [200, 201]:
-                    try:
-                        return response.json()
-                    except ValueError:
-                        return response
-                
-                return response
+                raise requests.exceptions.HTTPError(response=response)
+            
+            # No body to decode; treat as an empty payload rather than
+            # falling through to a decode error.
+            if response.status_code in [204, 304]:
+                response.close()
+                return {}
+
+            if is_handle_error_required:
+                self.handle_error(response, logger_msg)
+            
+            if response.status_code in [200, 201]:
+                if stream:
+                    if response.headers.get("Content-Length") == "0":
+                        response.close()
+                        return {}
+                    return response
+                return _json_loads(response.content) if response.content else {}
+            
+            return response
         except requests.exceptions.RequestException as exp:
             self.logger.error(
                 message=(
@@ -154,6 +241,5 @@ class ForescoutPluginHelper:
                 f"Status Code: {response.status_code}. "
                 f"Response: {response.text}"
             ),
-            details=str(traceback.format_exc()),
         )
         raise requests.exceptions.HTTPError(response=response)